@@ -5,27 +5,75 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "fastapi",
+#     "orjson",
 #     "uvicorn",
+#     "uvloop",
+#     "httptools",
 # ]
 # ///
 
 import os
 import sys
+import errno
 import re
-import subprocess
 from pathlib import Path
 from typing import List, Dict, Any
 import asyncio
+import orjson
 import uvicorn
 import time
 import shutil
-
-from fastapi import FastAPI, HTTPException, status
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+import hashlib
+import gzip
+from contextlib import asynccontextmanager
+from collections import OrderedDict
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
-app = FastAPI()
+
+class ConversationGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves the gen-assistant stream alone: its output is
+    relayed token by token, and compressing it would let the encoder hold
+    back bytes the client is waiting to display.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "http" and scope["path"].endswith("/gen-assistant"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resolve (and create) the conversations directory before serving, so the
+    # first request doesn't pay for it. A failure here isn't cached and is
+    # reported again by the endpoints.
+    try:
+        get_conversations_dir()
+    except RuntimeError as e:
+        print(f"Warning: {e}", file=sys.stderr)
+    yield
+
+
+# Conversation JSON and the pages compress well; bodies under 1 KiB aren't
+# worth the CPU. Level 5 gets most of the size reduction of 9 for far less.
+GZIP_MINIMUM_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 5
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(
+    ConversationGZipMiddleware,
+    minimum_size=GZIP_MINIMUM_SIZE,
+    compresslevel=GZIP_COMPRESS_LEVEL,
+)
 
 
 # Pydantic model for title update requests
@@ -51,14 +99,65 @@ class MessageContentUpdateRequest(BaseModel):
 
 DEFAULT_MODEL_NAME = "openrouter/deepseek/deepseek-chat-v3-0324:free"
 
+# Roles accepted in message filenames of the form "<digits>-<role>.md"
+MESSAGE_ROLES = frozenset({"system", "user", "assistant", "assistant-reasoning"})
+
+# Conversation ids and message filenames taken from the URL must be a single
+# plain path component made of these characters (and not "." or "..")
+SAFE_NAME_PATTERN = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+# Upper bound on message files read concurrently for a single conversation,
+# so a very long conversation can't tie up every worker thread or exhaust fds
+MESSAGE_READ_CONCURRENCY = 16
+
+# Leading bytes of a non-message file checked for NULs before showing it as text
+OTHER_FILE_PEEK_SIZE = 4096
+
+# Attachments with these extensions are reported as binary without opening them
+BINARY_FILE_EXTENSIONS = frozenset(
+    {
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".gif",
+        ".webp",
+        ".pdf",
+        ".zip",
+        ".gz",
+        ".tar",
+        ".wasm",
+        ".bin",
+        ".exe",
+    }
+)
+
+
+def parse_message_role(filename: str) -> str | None:
+    """
+    Returns the lowercased role if filename looks like "<digits>-<role>.md"
+    (case-insensitive), otherwise None.
+    A plain string parse is enough for this grammar, so no regex is involved.
+    """
+    prefix, sep, rest = filename.partition("-")
+    if not sep or not prefix.isdecimal():
+        return None
+    # Check the extension before lowercasing the rest, so a non-.md file that
+    # merely starts with digits is rejected without copying its whole name.
+    if rest[-3:].lower() != ".md":
+        return None
+    role = rest[:-3].lower()
+    return role if role in MESSAGE_ROLES else None
+
 
 # Function to determine the XDG_DATA_HOME based directory for web assets
+@lru_cache(maxsize=1)
 def get_web_data_dir() -> Path:
     """
     Determines the base directory for web assets.
     Uses $XDG_DATA_HOME/hinata/web, defaulting to
     $HOME/.local/share/hinata/web if $XDG_DATA_HOME is not set.
     Raises HTTPException if the directory cannot be confirmed.
+    The result is resolved once per process; failures are not cached.
     """
     xdg_data_home = os.getenv("XDG_DATA_HOME")
     if xdg_data_home:
@@ -89,11 +188,17 @@ def get_web_data_dir() -> Path:
 
 # Copied and adapted from chat/hnt-chat.py
 # Ensure this function is aligned with how hnt-chat determines the base directory.
+@lru_cache(maxsize=1)
 def get_conversations_dir():
     """
     Determines and ensures the existence of the base directory for conversations.
     Uses $XDG_DATA_HOME/hinata/chat/conversations, defaulting to
     $HOME/.local/share/hinata/chat/conversations if $XDG_DATA_HOME is not set.
+    The result, including the mkdir, is resolved once per process (the
+    directory is not expected to move while the server is running); failures
+    are not cached and are retried on the next request.
+    Raises RuntimeError rather than HTTPException, so nothing HTTP-specific
+    ends up inside the cached call; endpoints turn it into a 500.
     """
     xdg_data_home = os.getenv("XDG_DATA_HOME")
     if xdg_data_home:
@@ -123,290 +228,767 @@ def get_conversations_dir():
         # Depending on requirements, might raise HTTPException here if dir is critical
 
     if not conversations_dir.is_dir():
-        raise HTTPException(
-            status_code=500,
-            detail=f"Conversations directory not found or is not a directory: {conversations_dir}",
+        raise RuntimeError(
+            f"Conversations directory not found or is not a directory: {conversations_dir}"
         )
 
     return conversations_dir
 
 
-# API endpoint to list conversations
-@app.get("/api/conversations")
-async def api_list_conversations() -> Dict[
-    str, List[Dict[str, Any]]
-]:  # Return type changed for is_pinned
-    conv_data_list = []
-    try:
-        conv_base_dir = get_conversations_dir()
-        # Get all directories first, initial sort is not strictly necessary here
-        # as we will sort the conv_data_list later based on multiple criteria.
-        # However, processing in a consistent order (e.g., by name) can be good practice.
-        conversation_dirs_initial = sorted(
-            [d for d in conv_base_dir.iterdir() if d.is_dir()],
-            key=lambda p: p.name,
-            reverse=True,  # Process newest first, though final sort order will dominate
-        )
-
-        for conv_dir in conversation_dirs_initial:
-            conv_id = conv_dir.name
-            title_file = conv_dir / "title.txt"
-            pinned_file = conv_dir / "pinned.txt"
-            title = "-"
-            is_pinned = False
-
-            try:
-                if title_file.is_file():
-                    title_content = title_file.read_text(encoding="utf-8").strip()
-                    if title_content:
-                        title = title_content
-                    else:  # File exists but is empty or whitespace
-                        title_file.write_text("-", encoding="utf-8")
-                        title = "-"
-                else:  # File does not exist
-                    title_file.write_text("-", encoding="utf-8")
-                    title = "-"
-            except Exception as e:
-                # Log error reading/writing title.txt, but proceed with default title
-                print(f"Error processing title for {conv_id}: {e}", file=sys.stderr)
-                title = "-"  # Fallback title
-
-            is_pinned = pinned_file.is_file()
-
-            conv_data_list.append(
-                {"id": conv_id, "title": title, "is_pinned": is_pinned}
-            )
-
-        # Sort: Pinned conversations first (is_pinned=True), then by ID (descending, newest first)
-        # Python's sort is stable. Sort by ID first, then by pinned status.
-        conv_data_list.sort(key=lambda x: x["id"], reverse=True)
-        conv_data_list.sort(key=lambda x: x["is_pinned"], reverse=True)
-
-    except RuntimeError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception as e:
+def check_safe_name(name: str, what: str) -> None:
+    """
+    Raises a 400 HTTPException unless name (a conversation id or message
+    filename from the URL) is a plain path component per SAFE_NAME_PATTERN.
+    Done before the name is joined onto any path, so "..%2F.." style input
+    is turned away without touching the filesystem.
+    """
+    if not SAFE_NAME_PATTERN.fullmatch(name) or name in (".", ".."):
         raise HTTPException(
-            status_code=500, detail=f"Error listing conversations: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {what} '{name}'.",
         )
-    return {"conversations": conv_data_list}
 
 
-# API endpoint to read a specific conversation
-@app.get("/api/conversation/{conversation_id}")
-async def api_read_conversation(conversation_id: str) -> Dict[str, Any]:
+def get_conversation_path(conversation_id: str) -> Path:
+    """
+    Returns the directory of an existing conversation, for the endpoints that
+    operate on one. Raises a 500 HTTPException if the conversations directory
+    is unavailable, a 404 if the conversation doesn't exist and a 400 if the
+    id isn't a valid directory name.
+    """
+    check_safe_name(conversation_id, "conversation id")
     try:
         conv_base_dir = get_conversations_dir()
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
 
     conv_path = conv_base_dir / conversation_id
-
     if not conv_path.is_dir():
         raise HTTPException(
-            status_code=404, detail=f"Conversation '{conversation_id}' not found."
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Conversation '{conversation_id}' not found.",
         )
+    return conv_path
 
-    messages_data: List[Dict[str, str]] = []
-    other_files_data: List[Dict[str, Any]] = []
-
-    filename_pattern = re.compile(
-        r"^\d+-(system|user|assistant|assistant-reasoning)\.md$", re.IGNORECASE
-    )
 
-    all_item_paths_in_dir = []
+def read_text_file(path: str, size: int | None = None) -> str | Exception:
+    """
+    Reads a UTF-8 text file, meant to be run in a worker thread via
+    asyncio.to_thread. Returns the exception instead of raising it so callers
+    can fall back per file.
+
+    The file is read with a single os.read() sized from fstat() (or from
+    size, if the caller already has it from a stat) instead of going through
+    open()'s buffered text layer. Line endings are normalized
+    to "\n" the way text mode would, but only when there is a "\r" at all.
+    """
     try:
-        all_item_paths_in_dir = list(conv_path.iterdir())
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            if size is None:
+                size = os.fstat(fd).st_size
+            # Ask for one byte more than the size: a short result means EOF
+            # was reached, so a file that didn't change needs just one read.
+            data = os.read(fd, size + 1)
+            if len(data) > size:  # The file grew since it was stat()ed
+                chunks = [data]
+                while chunk := os.read(fd, 1 << 18):
+                    chunks.append(chunk)
+                data = b"".join(chunks)
+        finally:
+            os.close(fd)
+        text = data.decode("utf-8")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
     except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error listing files in conversation '{conversation_id}': {str(e)}",
-        )
+        return e
 
-    matched_message_file_paths = []
-    other_file_paths = []
 
-    for item_path in all_item_paths_in_dir:
-        if item_path.is_file():
-            if filename_pattern.match(item_path.name):
-                matched_message_file_paths.append(item_path)
-            else:
-                other_file_paths.append(item_path)
+def read_other_file(
+    path: str, filename: str, size: int | None = None
+) -> Dict[str, Any]:
+    """
+    Builds the "other_files" entry for a non-message file in a conversation:
+    its content if it is UTF-8 text, otherwise an error_message saying why it
+    isn't shown. A size already known from a stat() lets an empty file skip
+    the open entirely.
+    """
+    file_data: Dict[str, Any] = {
+        "filename": filename,
+        "is_text": False,
+        "content": None,
+        "error_message": None,
+    }
 
-    matched_message_file_paths.sort(key=lambda p: p.name)
+    if os.path.splitext(filename)[1].lower() in BINARY_FILE_EXTENSIONS:
+        file_data["error_message"] = "[File content not displayed: likely binary]"
+        return file_data
 
-    for msg_file_path in matched_message_file_paths:
-        match = filename_pattern.match(msg_file_path.name)
-        role = "unknown"
-        if match:
-            role = match.group(1).lower()
+    if size == 0:
+        file_data["content"] = ""
+        file_data["is_text"] = True
+        return file_data
 
-        content_text = ""
+    try:
+        # Only the first OTHER_FILE_PEEK_SIZE bytes are read before the NUL
+        # sniff, so binary attachments are never pulled into memory whole.
+        # Files that are modified by other processes are read, not mapped:
+        # truncating a mapped file would crash the server with SIGBUS.
+        fd = os.open(path, os.O_RDONLY)
         try:
-            content_text = msg_file_path.read_text(encoding="utf-8")
-        except Exception as e:
-            content_text = f"Error reading file: {str(e)}"
-            role = "unknown"  # Fallback role if content is unreadable
-
-        messages_data.append(
-            {"role": role, "filename": msg_file_path.name, "content": content_text}
+            data = os.read(fd, OTHER_FILE_PEEK_SIZE)
+            if b"\0" in data:
+                file_data["error_message"] = (
+                    "[File content not displayed: likely binary]"
+                )
+            else:
+                if len(data) == OTHER_FILE_PEEK_SIZE:
+                    # Ask for the rest plus one byte: a short result means
+                    # EOF was reached, so a file that didn't change needs
+                    # just one more read.
+                    requested = max(os.fstat(fd).st_size - len(data), 0) + 1
+                    chunks = [data, os.read(fd, requested)]
+                    if len(chunks[1]) == requested:  # It grew since the fstat()
+                        while chunk := os.read(fd, 1 << 18):
+                            chunks.append(chunk)
+                    data = b"".join(chunks)
+                text = data.decode("utf-8")
+                # Same newline translation as read_text_file()
+                if "\r" in text:
+                    text = text.replace("\r\n", "\n").replace("\r", "\n")
+                file_data["content"] = text
+                file_data["is_text"] = True
+        finally:
+            os.close(fd)
+    except UnicodeDecodeError as decode_err:
+        if decode_err.start < OTHER_FILE_PEEK_SIZE:
+            file_data["error_message"] = (
+                "[File content not displayed: initial chunk not UTF-8]"
+            )
+        else:
+            file_data["error_message"] = "[File content not displayed: not valid UTF-8]"
+    except OSError as e:
+        file_data["error_message"] = f"[Error accessing file: {str(e)}]"
+        print(  # Log server-side for debugging
+            f"Error processing other file {path}: {e}",
+            file=sys.stderr,
         )
 
-    if other_file_paths:
-        other_file_paths.sort(key=lambda p: p.name)
-        PEEK_SIZE = 4096
+    return file_data
 
-        for other_file_path in other_file_paths:
-            file_data: Dict[str, Any] = {
-                "filename": other_file_path.name,
-                "is_text": False,
-                "content": None,
-                "error_message": None,
-            }
 
-            try:
-                is_likely_text_content = True
-                with open(other_file_path, "rb") as f:
-                    chunk = f.read(PEEK_SIZE)
+def read_text_files(paths: List[str]) -> List[str | Exception]:
+    """Reads a batch of UTF-8 text files in one go, see read_text_file()."""
+    return [read_text_file(path) for path in paths]
 
-                if b"\0" in chunk:
-                    is_likely_text_content = False
-                    file_data["error_message"] = (
-                        "[File content not displayed: likely binary]"
-                    )
-                else:
-                    try:
-                        chunk.decode("utf-8")  # Check if initial chunk is decodable
-                        # Try to read full content if chunk decodes
-                        try:
-                            full_content = other_file_path.read_text(encoding="utf-8")
-                            file_data["is_text"] = True
-                            file_data["content"] = full_content
-                        except UnicodeDecodeError:
-                            is_likely_text_content = False
-                            file_data["error_message"] = (
-                                "[File content not displayed: not valid UTF-8]"
-                            )
-                        except Exception as read_err:  # Handle other read errors like file too large etc.
-                            is_likely_text_content = False
-                            file_data["error_message"] = (
-                                f"[File content not displayed: error reading full file - {str(read_err)}]"
-                            )
-
-                    except UnicodeDecodeError:
-                        is_likely_text_content = False
-                        file_data["error_message"] = (
-                            "[File content not displayed: initial chunk not UTF-8]"
-                        )
-
-                if not is_likely_text_content and not file_data["error_message"]:
-                    # Generic fallback if not marked as text and no specific error yet
-                    file_data["error_message"] = (
-                        "[File content not displayed: format not recognized as text]"
-                    )
-
-            except Exception as e:
-                file_data["error_message"] = f"[Error accessing file: {str(e)}]"
-                print(  # Log server-side for debugging
-                    f"Error processing other file {other_file_path}: {e}",
-                    file=sys.stderr,
-                )
 
-            other_files_data.append(file_data)
+def json_response(payload: Any, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Serializes payload with orjson and returns it as-is. Data endpoints are
+    declared with response_model=None, so FastAPI's response validation and
+    jsonable_encoder pass are skipped entirely.
+    """
+    return Response(
+        content=orjson.dumps(payload),
+        media_type="application/json",
+        status_code=status_code,
+    )
 
-    # Read conversation title
-    title = "-"  # Default title
-    title_file_path = conv_path / "title.txt"
+
+# Serialized /api/conversation bodies, keyed by conversation id and tagged
+# with the conversation's fingerprint at the time they were built:
+# (directory st_mtime_ns, number of files, newest file st_mtime_ns).
+# Adding, removing or renaming a file bumps the directory mtime, and
+# rewriting one in place (e.g. editing a message outside the web UI) bumps
+# its own mtime, so a stale entry is simply never matched again. Writes made
+# through the API also go through mark_conversation_changed(). Oldest
+# entries are evicted first, once there are more than CONVERSATION_CACHE_SIZE
+# of them or they hold more than CONVERSATION_CACHE_MAX_BYTES in total.
+# Bodies over CONVERSATION_CACHE_MAX_BODY aren't cached at all, so streaming
+# a conversation with large attachments doesn't keep it all in memory.
+ConversationFingerprint = tuple[int, int, int]
+# Entries are [fingerprint, body, gzipped body or None]. The gzipped copy is
+# made on the first cache hit that accepts gzip and reused after that.
+CONVERSATION_CACHE: "OrderedDict[str, list]" = OrderedDict()
+CONVERSATION_CACHE_SIZE = 128
+CONVERSATION_CACHE_MAX_BODY = 4 * 1024 * 1024
+CONVERSATION_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def get_cached_conversation(
+    conversation_id: str, fingerprint: ConversationFingerprint
+) -> list | None:
+    """Returns the cache entry for conversation_id if it is still current."""
+    cached = CONVERSATION_CACHE.get(conversation_id)
+    if cached is None or cached[0] != fingerprint:
+        return None
+    CONVERSATION_CACHE.move_to_end(conversation_id)
+    return cached
+
+
+def store_cached_conversation(
+    conversation_id: str, fingerprint: ConversationFingerprint, body: bytes
+):
+    CONVERSATION_CACHE[conversation_id] = [fingerprint, body, None]
+    CONVERSATION_CACHE.move_to_end(conversation_id)
+    trim_conversation_cache()
+
+
+def trim_conversation_cache():
+    """Evicts the oldest entries until the cache is within both limits."""
+    total_bytes = sum(
+        len(body) + len(gzipped or b"")
+        for _, body, gzipped in CONVERSATION_CACHE.values()
+    )
+    while CONVERSATION_CACHE and (
+        len(CONVERSATION_CACHE) > CONVERSATION_CACHE_SIZE
+        or total_bytes > CONVERSATION_CACHE_MAX_BYTES
+    ):
+        _, (_, body, gzipped) = CONVERSATION_CACHE.popitem(last=False)
+        total_bytes -= len(body) + len(gzipped or b"")
+
+
+def accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+
+# Last result of scan_conversations() as (time.monotonic(), st_mtime_ns of
+# the conversations directory, serialized response body, its ETag). Reused
+# while it is younger than CONVERSATION_LIST_TTL and no conversation was added
+# or removed since, so a burst of list requests costs one stat instead of a
+# full rescan. The TTL bounds how long changes made outside the server (e.g.
+# by hnt-chat) can go unnoticed; changes made through the API clear it right
+# away.
+CONVERSATION_LIST_CACHE: tuple[float, int, bytes, str] | None = None
+CONVERSATION_LIST_TTL = 2.0
+# Bumped by mark_conversation_changed(). A scan that was already running when
+# a change was made only stores its result if this is still what it started
+# with, so it can't put the pre-change list back into the cache.
+CONVERSATION_LIST_GENERATION = 0
+
+
+def mark_conversation_changed(conversation_id: str):
+    """
+    Drops the cached body for a conversation, and the cached conversation
+    list, after it was modified or created. In-place writes (title.txt,
+    model.txt) need no more than this: the file's new mtime already changes
+    the conversation's fingerprint.
+    """
+    global CONVERSATION_LIST_CACHE, CONVERSATION_LIST_GENERATION
+    CONVERSATION_LIST_CACHE = None
+    CONVERSATION_LIST_GENERATION += 1
+    CONVERSATION_CACHE.pop(conversation_id, None)
+
+
+@lru_cache(maxsize=1024)
+def resolve_conversation_path(conversation_id: str) -> str:
+    """
+    Returns the realpath of a conversation directory as a string, for passing
+    to `hnt-chat --conversation`. Cached per id since a conversation's
+    location doesn't change while the server is running.
+    """
+    return str((get_conversations_dir() / conversation_id).resolve())
+
+
+def write_small_text_file(path: Path, text: str) -> None:
+    """
+    Replaces the contents of a small metadata file (title.txt, model.txt)
+    with text, encoded once as UTF-8 and written straight to the fd.
+    """
+    data = text.encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
     try:
-        if title_file_path.is_file():
-            title_content = title_file_path.read_text(encoding="utf-8").strip()
-            if title_content:
-                title = title_content
-    except Exception as e:
-        # Log error reading title, but proceed with default
-        print(
-            f"Error reading title for conversation {conversation_id}: {e}",
-            file=sys.stderr,
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=1)
+def get_hnt_chat_path() -> str:
+    """
+    Locates the hnt-chat executable in PATH once per process, so spawning it
+    doesn't repeat the PATH search on every request.
+    Raises FileNotFoundError if hnt-chat is not installed; failures are not
+    cached, so installing it later is picked up on the next request.
+    """
+    hnt_chat_path = shutil.which("hnt-chat")
+    if hnt_chat_path is None:
+        raise FileNotFoundError(
+            "`hnt-chat` command not found. Please ensure it is installed and in the system PATH."
         )
-        # title remains "-"
+    return hnt_chat_path
 
-    # Read conversation model
-    model = DEFAULT_MODEL_NAME  # Default model
-    model_file_path = conv_path / "model.txt"
+
+# Errors meaning an in-kernel copy can't be used for this pair of files
+KERNEL_COPY_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.EINVAL,
+}
+
+
+def sendfile_copy(src_fd: int, dst_fd: int, count: int) -> int:
+    """os.sendfile with copy_file_range's argument order, from the file offset."""
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+
+# In-kernel copy calls taking (src_fd, dst_fd, count), in order of preference.
+# copy_file_range can reflink on CoW filesystems but refuses e.g. some
+# cross-filesystem pairs on older kernels; sendfile still keeps the data in
+# the kernel there. Only Linux's sendfile accepts a regular file as target.
+KERNEL_COPY_FUNCTIONS = []
+if hasattr(os, "copy_file_range"):
+    KERNEL_COPY_FUNCTIONS.append(os.copy_file_range)
+if sys.platform.startswith("linux") and hasattr(os, "sendfile"):
+    KERNEL_COPY_FUNCTIONS.append(sendfile_copy)
+
+
+def copy_file_fast(src_path: str, dst_path: str) -> None:
+    """
+    Copies a regular file like shutil.copy2 (data, permission bits, timestamps),
+    but lets the kernel move the data so it never passes through userspace:
+    copy_file_range first, then sendfile. Falls back to a plain read/write
+    loop when neither is usable for the two files, and to shutil.copy2 (which
+    uses fcopyfile on macOS) on platforms that have neither.
+    """
+    if not KERNEL_COPY_FUNCTIONS:
+        shutil.copy2(src_path, dst_path)
+        return
+
+    src_fd = os.open(src_path, os.O_RDONLY)
     try:
-        if model_file_path.is_file():
-            model_content = model_file_path.read_text(encoding="utf-8").strip()
-            if model_content:
-                model = model_content
-    except Exception as e:
-        # Log error reading model, but proceed with default
-        print(
-            f"Error reading model.txt for conversation {conversation_id}: {e}",
-            file=sys.stderr,
-        )
-        # model remains DEFAULT_MODEL_NAME
+        src_stat = os.fstat(src_fd)
+        dst_fd = os.open(dst_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            remaining = src_stat.st_size
+            # Each method leaves both file offsets just past whatever it
+            # copied, so the next one simply continues from there.
+            for kernel_copy in KERNEL_COPY_FUNCTIONS:
+                try:
+                    while remaining > 0:
+                        copied = kernel_copy(src_fd, dst_fd, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                    break
+                except OSError as e:
+                    if e.errno not in KERNEL_COPY_UNSUPPORTED:
+                        raise
+            else:
+                while chunk := os.read(src_fd, 256 * 1024):
+                    view = memoryview(chunk)
+                    while view:
+                        view = view[os.write(dst_fd, view) :]
 
-    # Check if conversation is pinned
-    pinned_file_path = conv_path / "pinned.txt"
-    is_pinned = pinned_file_path.is_file()
+            os.fchmod(dst_fd, src_stat.st_mode & 0o7777)
+            os.utime(dst_fd, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
 
+
+async def run_hnt_chat(args: List[str], input_text: str | None = None):
+    """
+    Runs `hnt-chat <args>` without blocking the event loop.
+    Returns (returncode, stdout, stderr) with the output decoded as UTF-8.
+    Raises FileNotFoundError if hnt-chat is not in PATH.
+    """
+    process = await asyncio.create_subprocess_exec(
+        get_hnt_chat_path(),
+        *args,
+        stdin=asyncio.subprocess.PIPE if input_text is not None else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout_bytes, stderr_bytes = await process.communicate(
+        input_text.encode("utf-8") if input_text is not None else None
+    )
+    return (
+        process.returncode,
+        stdout_bytes.decode("utf-8", errors="replace"),
+        stderr_bytes.decode("utf-8", errors="replace"),
+    )
+
+
+def read_conversation_summary(conv_base_dir: Path, conv_id: str) -> Dict[str, Any]:
+    """Returns the {id, title, is_pinned} list entry for one conversation."""
+    conv_path = os.path.join(conv_base_dir, conv_id)
+    title = "-"
+    # Listing is read-only: a missing or empty title.txt is shown as "-"
+    # without writing a placeholder back to disk.
+    try:
+        with open(os.path.join(conv_path, "title.txt"), encoding="utf-8") as f:
+            title = f.read().strip() or "-"
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # Log error reading title.txt, but proceed with default title
+        print(f"Error processing title for {conv_id}: {e}", file=sys.stderr)
     return {
-        "conversation_id": conversation_id,
+        "id": conv_id,
         "title": title,
-        "model": model,
-        "is_pinned": is_pinned,  # Add pinned status
-        "messages": messages_data,
-        "other_files": other_files_data,
+        "is_pinned": os.path.isfile(os.path.join(conv_path, "pinned.txt")),
     }
 
 
-# API endpoint to update a conversation's title
-@app.put("/api/conversation/{conversation_id}/title")
-async def update_conversation_title(conversation_id: str, request: TitleUpdateRequest):
+def scan_conversations(conv_base_dir: Path) -> List[Dict[str, Any]]:
+    """
+    Builds the conversation list ({id, title, is_pinned}, pinned first, then
+    newest first). This is blocking directory and file I/O, so the endpoint
+    runs it in a worker thread.
+    """
+    # os.scandir reports the entry type from the directory listing itself,
+    # so is_dir() doesn't cost an extra stat per conversation.
+    # Only the names are kept, so the sort compares plain strings with no
+    # key function.
+    with os.scandir(conv_base_dir) as entries:
+        conversation_ids = [entry.name for entry in entries if entry.is_dir()]
+    conversation_ids.sort(reverse=True)  # Newest first
+
+    conv_data_list = [
+        read_conversation_summary(conv_base_dir, conv_id)
+        for conv_id in conversation_ids
+    ]
+    # Pinned first. The list is already newest first and Python's sort is
+    # stable, so sorting by pinned status alone keeps that order within each
+    # group.
+    conv_data_list.sort(key=itemgetter("is_pinned"), reverse=True)
+    return conv_data_list
+
+
+# API endpoint to list conversations
+@app.get("/api/conversations", response_model=None)
+async def api_list_conversations(request: Request) -> Response:
+    global CONVERSATION_LIST_CACHE
     try:
         conv_base_dir = get_conversations_dir()
+        now = time.monotonic()
+        base_mtime_ns = os.stat(conv_base_dir).st_mtime_ns
+        cached = CONVERSATION_LIST_CACHE
+        if (
+            cached is not None
+            and now - cached[0] < CONVERSATION_LIST_TTL
+            and cached[1] == base_mtime_ns
+        ):
+            body, etag = cached[2], cached[3]
+        else:
+            # One title.txt read and one stat per conversation adds up; keep it
+            # off the event loop so other requests aren't stalled meanwhile.
+            generation = CONVERSATION_LIST_GENERATION
+            conv_data_list = await asyncio.to_thread(scan_conversations, conv_base_dir)
+            body = orjson.dumps({"conversations": conv_data_list})
+            # The base directory's mtime doesn't change when a title or pin
+            # does, so the ETag is taken from the list itself.
+            etag = "W/" + static_etag(body)
+            if generation == CONVERSATION_LIST_GENERATION:
+                CONVERSATION_LIST_CACHE = (now, base_mtime_ns, body, etag)
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error listing conversations: {str(e)}"
+        )
+    # no-cache: pollers revalidate and get an empty 304 until the list changes
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-    conv_path = conv_base_dir / conversation_id
-    if not conv_path.is_dir():
+
+def scan_conversation_dir(
+    conv_path: str,
+) -> tuple[list, List[os.DirEntry], set[str], ConversationFingerprint]:
+    """
+    Lists a conversation directory in a single pass, returning its message
+    entries as (name, entry, role), its other file entries, the set of all
+    file names and its fingerprint. This is blocking I/O, so the endpoint
+    runs it in a worker thread. Raises FileNotFoundError or
+    NotADirectoryError if there is no such conversation.
+    """
+    # The directory mtime, taken before listing it, is part of the
+    # fingerprint that identifies this version of the conversation.
+    dir_mtime_ns = os.stat(conv_path).st_mtime_ns
+
+    # DirEntry.is_file() is answered from the listing, and the collected names
+    # let the endpoint skip stat() calls for title/model/pinned. Each file's
+    # mtime is still needed for the fingerprint, but a stat is far cheaper
+    # than reading and serializing the conversation again.
+    matched_message_entries = []
+    other_file_entries = []
+    file_names_in_dir = set()
+    newest_file_mtime_ns = 0
+    with os.scandir(conv_path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                try:
+                    file_mtime_ns = entry.stat().st_mtime_ns
+                except FileNotFoundError:
+                    continue  # Removed while we were listing
+                if file_mtime_ns > newest_file_mtime_ns:
+                    newest_file_mtime_ns = file_mtime_ns
+                file_names_in_dir.add(entry.name)
+                role = parse_message_role(entry.name)
+                if role:
+                    # Keep the parsed role so the name isn't parsed twice
+                    matched_message_entries.append((entry.name, entry, role))
+                else:
+                    other_file_entries.append(entry)
+
+    fingerprint = (dir_mtime_ns, len(file_names_in_dir), newest_file_mtime_ns)
+    return matched_message_entries, other_file_entries, file_names_in_dir, fingerprint
+
+
+# API endpoint to read a specific conversation
+@app.get("/api/conversation/{conversation_id}", response_model=None)
+async def api_read_conversation(conversation_id: str, request: Request) -> Response:
+    check_safe_name(conversation_id, "conversation id")
+    try:
+        conv_base_dir = get_conversations_dir()
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    conv_path = os.path.join(conv_base_dir, conversation_id)
+
+    # A conversation can have thousands of files, and each one is stat()ed
+    # for the fingerprint; keep the scan off the event loop, even when the
+    # answer ends up being a 304 or a cache hit.
+    try:
+        (
+            matched_message_entries,
+            other_file_entries,
+            file_names_in_dir,
+            fingerprint,
+        ) = await asyncio.to_thread(scan_conversation_dir, conv_path)
+    except (FileNotFoundError, NotADirectoryError):
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversation '{conversation_id}' not found.",
+            status_code=404, detail=f"Conversation '{conversation_id}' not found."
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error listing files in conversation '{conversation_id}': {str(e)}",
+        )
+
+    etag = 'W/"%x-%x-%x"' % fingerprint
+    # no-cache: the browser may keep the body but must revalidate each time.
+    # Only bodies served from the cache carry the ETag, since only those are
+    # known to have been read without errors.
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cached = get_cached_conversation(conversation_id, fingerprint)
+    if cached is not None:
+        body = cached[1]
+        if len(body) < GZIP_MINIMUM_SIZE or not accepts_gzip(request):
+            return Response(
+                content=body, media_type="application/json", headers=headers
+            )
+        # Serve the stored gzip bytes directly; the middleware passes
+        # responses that already have a Content-Encoding through untouched,
+        # so repeat hits skip compression entirely.
+        if cached[2] is None:
+            cached[2] = await asyncio.to_thread(
+                gzip.compress, body, GZIP_COMPRESS_LEVEL, mtime=0
+            )
+            trim_conversation_cache()
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+        return Response(
+            content=cached[2], media_type="application/json", headers=headers
         )
 
+    # Tuples lead with the (unique) filename, so they sort without a key
+    matched_message_entries.sort()
+
+    # title.txt and model.txt are needed before the response starts, so read
+    # them together in one worker-thread hop.
+    metadata_paths = []
+    title_index = model_index = None
+    if "title.txt" in file_names_in_dir:
+        title_index = len(metadata_paths)
+        metadata_paths.append(os.path.join(conv_path, "title.txt"))
+    if "model.txt" in file_names_in_dir:
+        model_index = len(metadata_paths)
+        metadata_paths.append(os.path.join(conv_path, "model.txt"))
+    metadata_results = await asyncio.to_thread(read_text_files, metadata_paths)
+
+    other_file_entries.sort(key=attrgetter("name"))
+
+    # A read error falls back to a default below; like a message read error,
+    # that body mustn't be cached
+    metadata_cacheable = True
+
+    # Conversation title, read in the batch above
+    title = "-"  # Default title
+    if title_index is not None:
+        title_result = metadata_results[title_index]
+        if isinstance(title_result, Exception):
+            metadata_cacheable = False
+            # Log error reading title, but proceed with default
+            print(
+                f"Error reading title for conversation {conversation_id}: {title_result}",
+                file=sys.stderr,
+            )
+        elif title_result.strip():
+            title = title_result.strip()
+
+    # Conversation model, read in the batch above
+    model = DEFAULT_MODEL_NAME  # Default model
+    if model_index is not None:
+        model_result = metadata_results[model_index]
+        if isinstance(model_result, Exception):
+            metadata_cacheable = False
+            # Log error reading model, but proceed with default
+            print(
+                f"Error reading model.txt for conversation {conversation_id}: {model_result}",
+                file=sys.stderr,
+            )
+        elif model_result.strip():
+            model = model_result.strip()
+
+    # Check if conversation is pinned
+    is_pinned = "pinned.txt" in file_names_in_dir
+
+    metadata_json = orjson.dumps(
+        {
+            "conversation_id": conversation_id,
+            "title": title,
+            "model": model,
+            "is_pinned": is_pinned,  # Add pinned status
+        }
+    )
+
+    read_slots = asyncio.Semaphore(MESSAGE_READ_CONCURRENCY)
+
+    async def read_in_slot(read_func, *args):
+        async with read_slots:
+            return await asyncio.to_thread(read_func, *args)
+
+    def start_message_read(msg_entry: os.DirEntry):
+        # DirEntry caches the stat() from the scandir pass, so the size is
+        # free here; empty messages don't need a worker thread at all.
+        size = msg_entry.stat().st_size
+        if size == 0:
+            return None
+        return asyncio.ensure_future(read_in_slot(read_text_file, msg_entry.path, size))
+
+    async def stream_conversation():
+        # Message bodies and other files make up most of the payload, so
+        # rather than holding them all in memory, emit the metadata object
+        # without its closing brace and then each message and other file as
+        # soon as it has been read. All reads are started up front (bounded
+        # by read_slots) so they overlap, but are still emitted in filename
+        # order.
+        read_tasks = [
+            start_message_read(msg_entry) for _, msg_entry, _ in matched_message_entries
+        ]
+        other_file_tasks = [
+            asyncio.ensure_future(
+                read_in_slot(
+                    read_other_file,
+                    other_entry.path,
+                    other_entry.name,
+                    other_entry.stat().st_size,
+                )
+            )
+            for other_entry in other_file_entries
+        ]
+        # Everything sent is also kept so the full body can be cached once
+        # the stream completes, unless it turns out not to be cacheable
+        body_chunks = []
+        body_size = 0
+        cacheable = metadata_cacheable
+
+        def keep(chunk: bytes) -> bytes:
+            nonlocal body_size, cacheable
+            if cacheable:
+                body_size += len(chunk)
+                if body_size > CONVERSATION_CACHE_MAX_BODY:
+                    cacheable = False
+                    body_chunks.clear()
+                else:
+                    body_chunks.append(chunk)
+            return chunk
+
+        try:
+            yield keep(metadata_json[:-1] + b',"messages":[')
+            for index, (_, msg_entry, role) in enumerate(matched_message_entries):
+                read_task = read_tasks[index]
+                content_result = "" if read_task is None else await read_task
+                if isinstance(content_result, Exception):
+                    content_text = f"Error reading file: {str(content_result)}"
+                    role = "unknown"  # Fallback role if content is unreadable
+                    cacheable = False  # Don't pin a possibly transient error
+                    body_chunks.clear()
+                else:
+                    content_text = content_result
+
+                message_json = orjson.dumps(
+                    {"role": role, "filename": msg_entry.name, "content": content_text}
+                )
+                yield keep(message_json if index == 0 else b"," + message_json)
+            yield keep(b'],"other_files":[')
+            for index, other_file_task in enumerate(other_file_tasks):
+                file_json = orjson.dumps(await other_file_task)
+                yield keep(file_json if index == 0 else b"," + file_json)
+            yield keep(b"]}")
+
+            if cacheable:
+                store_cached_conversation(
+                    conversation_id, fingerprint, b"".join(body_chunks)
+                )
+        finally:
+            # Client went away mid-stream: don't leave reads queued up
+            for task in read_tasks + other_file_tasks:
+                if task is not None:
+                    task.cancel()
+
+    # Whether this body will turn out clean isn't known until it has been
+    # streamed, so don't let the browser keep (and later revalidate) it. The
+    # next request is answered from the cache, with the ETag.
+    return StreamingResponse(
+        stream_conversation(),
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"},
+    )
+
+
+# API endpoint to update a conversation's title
+@app.put("/api/conversation/{conversation_id}/title", response_model=None)
+async def update_conversation_title(conversation_id: str, request: TitleUpdateRequest):
+    conv_path = get_conversation_path(conversation_id)
+
     title_file_path = conv_path / "title.txt"
     new_title = request.title.strip()
     if not new_title:  # If stripping results in an empty string, save as "-"
         new_title = "-"
 
     try:
-        title_file_path.write_text(new_title, encoding="utf-8")
+        write_small_text_file(title_file_path, new_title)
+        mark_conversation_changed(conversation_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error writing title for conversation '{conversation_id}': {str(e)}",
         )
 
-    return JSONResponse(
-        content={"message": "Title updated successfully", "new_title": new_title},
+    return json_response(
+        {"message": "Title updated successfully", "new_title": new_title},
         status_code=status.HTTP_200_OK,
     )
 
 
 # API endpoint to update a conversation's model
-@app.put("/api/conversation/{conversation_id}/model")
+@app.put("/api/conversation/{conversation_id}/model", response_model=None)
 async def update_conversation_model(conversation_id: str, request: ModelUpdateRequest):
-    try:
-        conv_base_dir = get_conversations_dir()
-    except RuntimeError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    conv_path = conv_base_dir / conversation_id
-    if not conv_path.is_dir():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversation '{conversation_id}' not found.",
-        )
+    conv_path = get_conversation_path(conversation_id)
 
     model_file_path = conv_path / "model.txt"
     new_model_requested = request.model.strip()
@@ -417,15 +999,16 @@ async def update_conversation_model(conversation_id: str, request: ModelUpdateRe
     )
 
     try:
-        model_file_path.write_text(effective_model_to_save, encoding="utf-8")
+        write_small_text_file(model_file_path, effective_model_to_save)
+        mark_conversation_changed(conversation_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error writing model.txt for conversation '{conversation_id}': {str(e)}",
         )
 
-    return JSONResponse(
-        content={
+    return json_response(
+        {
             "message": "Model updated successfully",
             "new_model": effective_model_to_save,
         },
@@ -433,29 +1016,166 @@ async def update_conversation_model(conversation_id: str, request: ModelUpdateRe
     )
 
 
+def load_static_page(path: Path) -> tuple[bytes, str]:
+    """
+    Reads a static page (or other small asset) into memory and returns
+    (content, strong ETag). These only change when the build script is
+    re-run, so they are loaded once at startup instead of being re-read from
+    disk on every hit. Raises HTTPException if the file cannot be read.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=(
+                f"Could not read web page {path}: {e}. "
+                "Please ensure build.sh has been run successfully."
+            ),
+        )
+    return data, static_etag(data)
+
+
+def static_etag(data: bytes) -> str:
+    return f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+
+
+def link_versioned_assets(page: bytes, asset_etags: Dict[str, str]) -> bytes:
+    """
+    Rewrites the page's references to each asset URL into "<url>?v=<hash>".
+    The URL then changes whenever the file does, so the asset itself can be
+    cached for good (see asset_cache_control()).
+    """
+    for url, etag in asset_etags.items():
+        version = asset_version(etag)
+        page = page.replace(f'"{url}"'.encode(), f'"{url}?v={version}"'.encode())
+    return page
+
+
+def asset_version(etag: str) -> str:
+    return etag.strip('"')[:16]
+
+
+# Versioned asset URLs never change content, so the browser needn't revalidate
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def asset_cache_control(request: Request, etag: str, unversioned: str) -> str:
+    # A stale v (a page from before a redeploy) mustn't pin the new bytes
+    # under the old URL, so only the current version is cached for good
+    if request.query_params.get("v") == asset_version(etag):
+        return IMMUTABLE_CACHE_CONTROL
+    return unversioned
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Returns True if an If-None-Match header value matches etag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        # Weak comparison, as If-None-Match calls for
+        if candidate == "*" or candidate.removeprefix("W/") == etag.removeprefix("W/"):
+            return True
+    return False
+
+
+def cached_page_response(
+    request: Request,
+    content: bytes,
+    etag: str,
+    media_type: str = "text/html",
+    cache_control: str = "public, max-age=60",
+) -> Response:
+    """Serves an in-memory page, answering 304 if the client already has it."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
 # Setup static file serving after API routes are defined
 try:
     WEB_DATA_DIR = get_web_data_dir()
+    INDEX_PAGE, INDEX_PAGE_ETAG = load_static_page(WEB_DATA_DIR / "index.html")
+    CONVERSATION_PAGE, CONVERSATION_PAGE_ETAG = load_static_page(
+        WEB_DATA_DIR / "conversation.html"
+    )
+    STYLESHEET, STYLESHEET_ETAG = load_static_page(WEB_DATA_DIR / "css" / "style.css")
+    SCRIPT, SCRIPT_ETAG = load_static_page(WEB_DATA_DIR / "js" / "script.js")
+    FAVICON, FAVICON_ETAG = load_static_page(WEB_DATA_DIR / "favicon.svg")
+
+    # Both pages link the assets above by content hash; their ETags have to
+    # cover the rewritten bytes.
+    ASSET_ETAGS = {
+        "/css/style.css": STYLESHEET_ETAG,
+        "/js/script.js": SCRIPT_ETAG,
+        "/favicon.svg": FAVICON_ETAG,
+    }
+    INDEX_PAGE = link_versioned_assets(INDEX_PAGE, ASSET_ETAGS)
+    INDEX_PAGE_ETAG = static_etag(INDEX_PAGE)
+    CONVERSATION_PAGE = link_versioned_assets(CONVERSATION_PAGE, ASSET_ETAGS)
+    CONVERSATION_PAGE_ETAG = static_etag(CONVERSATION_PAGE)
+
+    # The shared stylesheet and script are served from memory like the pages.
+    # These routes must come before the /css and /js mounts to take priority.
+    @app.get("/css/style.css", include_in_schema=False)
+    async def serve_stylesheet(request: Request):
+        return cached_page_response(
+            request,
+            STYLESHEET,
+            STYLESHEET_ETAG,
+            media_type="text/css",
+            cache_control=asset_cache_control(
+                request, STYLESHEET_ETAG, "public, max-age=60"
+            ),
+        )
+
+    @app.get("/js/script.js", include_in_schema=False)
+    async def serve_script(request: Request):
+        return cached_page_response(
+            request,
+            SCRIPT,
+            SCRIPT_ETAG,
+            media_type="text/javascript",
+            cache_control=asset_cache_control(
+                request, SCRIPT_ETAG, "public, max-age=60"
+            ),
+        )
 
     # Serve CSS files
     app.mount("/css", StaticFiles(directory=WEB_DATA_DIR / "css"), name="css")
     # Serve JavaScript files
     app.mount("/js", StaticFiles(directory=WEB_DATA_DIR / "js"), name="js")
 
+    # The favicon used to be inlined as a data URL in both pages; as its own
+    # file the browser fetches it once and then keeps it for a day.
+    @app.get("/favicon.svg", include_in_schema=False)
+    async def serve_favicon(request: Request):
+        return cached_page_response(
+            request,
+            FAVICON,
+            FAVICON_ETAG,
+            media_type="image/svg+xml",
+            cache_control=asset_cache_control(
+                request, FAVICON_ETAG, "public, max-age=86400"
+            ),
+        )
+
     # Serve index.html for the root path
-    @app.get("/", response_class=FileResponse)
-    async def serve_index():
-        return FileResponse(WEB_DATA_DIR / "index.html")
+    @app.get("/", response_class=HTMLResponse)
+    async def serve_index(request: Request):
+        return cached_page_response(request, INDEX_PAGE, INDEX_PAGE_ETAG)
 
     # Serve conversation.html for specific conversation view paths
     @app.get(
-        "/conversation-page/{conversation_id_path:path}", response_class=FileResponse
+        "/conversation-page/{conversation_id_path:path}", response_class=HTMLResponse
     )
-    async def serve_conversation_page(conversation_id_path: str):
+    async def serve_conversation_page(request: Request, conversation_id_path: str):
         # conversation_id_path is used by FastAPI for routing,
         # but the actual file served is always conversation.html.
         # JavaScript on the client side will use the path to fetch specific data.
-        return FileResponse(WEB_DATA_DIR / "conversation.html")
+        return cached_page_response(request, CONVERSATION_PAGE, CONVERSATION_PAGE_ETAG)
 
 except HTTPException as e:
     # If get_web_data_dir() raises an HTTPException (e.g. dir not found),
@@ -474,21 +1194,19 @@ except HTTPException as e:
 
 
 # API endpoint to create a new conversation
-@app.post("/api/conversations/create", status_code=status.HTTP_201_CREATED)
+@app.post(
+    "/api/conversations/create",
+    status_code=status.HTTP_201_CREATED,
+    response_model=None,
+)
 async def api_create_conversation():
     try:
-        # Assuming `hnt-chat` is in PATH. Pass the current environment.
-        process = subprocess.run(
-            ["hnt-chat", "new"],
-            capture_output=True,
-            text=True,
-            check=False,  # We handle non-zero exit codes manually
-            env=os.environ.copy(),
-        )
+        # Assuming `hnt-chat` is in PATH. The child inherits the current environment.
+        returncode, stdout, stderr = await run_hnt_chat(["new"])
 
-        if process.returncode == 0:
+        if returncode == 0:
             # `hnt-chat new` outputs the full path to the new conversation directory.
-            full_conversation_path_str = process.stdout.strip()
+            full_conversation_path_str = stdout.strip()
             if not full_conversation_path_str:
                 # This case should ideally not happen if hnt-chat new works correctly
                 error_detail = "Failed to create conversation: `hnt-chat new` did not return a path."
@@ -502,15 +1220,19 @@ async def api_create_conversation():
 
             # Extract just the final directory name (the ID) from the path
             new_conversation_id = Path(full_conversation_path_str).name
-
-            return {
-                "message": "Conversation created successfully.",
-                "conversation_id": new_conversation_id,  # This is the directory name
-            }
+            mark_conversation_changed(new_conversation_id)
+
+            return json_response(
+                {
+                    "message": "Conversation created successfully.",
+                    "conversation_id": new_conversation_id,  # This is the directory name
+                },
+                status_code=status.HTTP_201_CREATED,
+            )
         else:
-            error_detail = f"Failed to create conversation. `hnt-chat new` exited with code {process.returncode}."
-            if process.stderr:
-                error_detail += f" Stderr: {process.stderr.strip()}"
+            error_detail = f"Failed to create conversation. `hnt-chat new` exited with code {returncode}."
+            if stderr:
+                error_detail += f" Stderr: {stderr.strip()}"
             print(f"Error in api_create_conversation: {error_detail}", file=sys.stderr)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -536,21 +1258,12 @@ async def api_create_conversation():
 @app.post(
     "/api/conversation/{conversation_id}/add-message",
     status_code=status.HTTP_201_CREATED,
+    response_model=None,
 )
 async def api_add_message_to_conversation(
     conversation_id: str, request: MessageAddRequest
 ):
-    try:
-        conv_base_dir = get_conversations_dir()
-    except RuntimeError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    conv_path = conv_base_dir / conversation_id
-    if not conv_path.is_dir():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversation '{conversation_id}' not found.",
-        )
+    get_conversation_path(conversation_id)  # 404 if it doesn't exist
 
     if request.role not in ["user", "system", "assistant"]:
         raise HTTPException(
@@ -559,30 +1272,30 @@ async def api_add_message_to_conversation(
         )
 
     try:
-        cmd = [
-            "hnt-chat",
+        args = [
             "add",
             request.role,
             "--conversation",
-            str(conv_path.resolve()),
+            resolve_conversation_path(conversation_id),
         ]
 
-        process = subprocess.run(
-            cmd,
-            input=request.content,
-            capture_output=True,
-            text=True,
-            check=False,
-            env=os.environ.copy(),
+        returncode, stdout, stderr = await run_hnt_chat(
+            args, input_text=request.content
         )
 
-        if process.returncode == 0:
-            new_filename = process.stdout.strip()
-            return {"message": "Message added successfully.", "filename": new_filename}
+        if returncode == 0:
+            mark_conversation_changed(conversation_id)
+            new_filename = stdout.strip()
+            return json_response(
+                {"message": "Message added successfully.", "filename": new_filename},
+                status_code=status.HTTP_201_CREATED,
+            )
         else:
-            error_detail = f"Failed to add message. `hnt-chat add` exited with code {process.returncode}."
-            if process.stderr:
-                error_detail += f" Stderr: {process.stderr.strip()}"
+            error_detail = (
+                f"Failed to add message. `hnt-chat add` exited with code {returncode}."
+            )
+            if stderr:
+                error_detail += f" Stderr: {stderr.strip()}"
             print(
                 f"Error in api_add_message_to_conversation: {error_detail}",
                 file=sys.stderr,
@@ -610,26 +1323,18 @@ async def api_add_message_to_conversation(
 
 @app.post("/api/conversation/{conversation_id}/gen-assistant")
 async def api_gen_assistant_message_stream(conversation_id: str):
-    try:
-        conv_base_dir = get_conversations_dir()
-    except RuntimeError as e:
-        # This error occurs if base dir cannot be determined, critical.
-        raise HTTPException(status_code=500, detail=str(e))
-
-    conv_path = conv_base_dir / conversation_id
-    if not conv_path.is_dir():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversation '{conversation_id}' not found.",
-        )
+    conv_path = get_conversation_path(conversation_id)
 
     model_file_path = conv_path / "model.txt"
     model_to_use = DEFAULT_MODEL_NAME  # Default defined elsewhere
+    # Just try the read: a missing model.txt is the uncommon case, so an
+    # is_file() check up front would be a wasted stat on every generation.
     try:
-        if model_file_path.is_file():
-            model_content = model_file_path.read_text(encoding="utf-8").strip()
-            if model_content:
-                model_to_use = model_content
+        model_content = model_file_path.read_text(encoding="utf-8").strip()
+        if model_content:
+            model_to_use = model_content
+    except FileNotFoundError:
+        pass
     except Exception as e:
         # Log warning but proceed with default model
         print(
@@ -637,8 +1342,7 @@ async def api_gen_assistant_message_stream(conversation_id: str):
             file=sys.stderr,
         )
 
-    cmd = [
-        "hnt-chat",
+    gen_args = [
         "gen",
         "--merge",  # Merge context before sending to LLM
         "--write",
@@ -646,7 +1350,7 @@ async def api_gen_assistant_message_stream(conversation_id: str):
         "--model",
         model_to_use,
         "--conversation",
-        str(conv_path.resolve()),
+        resolve_conversation_path(conversation_id),
         # DO NOT use --output-filename here, as it prints filename to stdout,
         # which would be mixed with the LLM stream.
         # --write is sufficient for file saving.
@@ -656,10 +1360,10 @@ async def api_gen_assistant_message_stream(conversation_id: str):
         process = None
         try:
             process = await asyncio.create_subprocess_exec(
-                *cmd,
+                get_hnt_chat_path(),
+                *gen_args,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                env=os.environ.copy(),
             )
 
             if process.stdout:
@@ -670,6 +1374,7 @@ async def api_gen_assistant_message_stream(conversation_id: str):
                     yield chunk  # Yield bytes directly
 
             return_code = await process.wait()
+            mark_conversation_changed(conversation_id)
 
             if return_code != 0:
                 stderr_output = ""
@@ -713,10 +1418,7 @@ async def api_gen_assistant_message_stream(conversation_id: str):
 
     try:
         # Quick check for hnt-chat before starting the stream process
-        if not shutil.which("hnt-chat"):
-            raise FileNotFoundError(
-                "`hnt-chat` command not found. Please ensure it is installed and in the system PATH."
-            )
+        get_hnt_chat_path()
         # Return the streaming response
         return StreamingResponse(
             stream_generator(), media_type="text/plain; charset=utf-8"
@@ -724,7 +1426,7 @@ async def api_gen_assistant_message_stream(conversation_id: str):
 
     except (
         FileNotFoundError
-    ) as fnf_error:  # Catches the explicit raise if shutil.which fails
+    ) as fnf_error:  # Raised by get_hnt_chat_path() if hnt-chat is missing
         print(
             f"Setup error for api_gen_assistant_message_stream: {str(fnf_error)}",
             file=sys.stderr,
@@ -746,20 +1448,12 @@ async def api_gen_assistant_message_stream(conversation_id: str):
 @app.post(
     "/api/conversation/{conversation_id}/message/{filename}/archive",
     status_code=status.HTTP_200_OK,
+    response_model=None,
 )
 async def api_archive_message(conversation_id: str, filename: str):
-    try:
-        conv_base_dir = get_conversations_dir()
-    except RuntimeError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    conv_path = conv_base_dir / conversation_id
-    if not conv_path.is_dir():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversation '{conversation_id}' not found.",
-        )
+    conv_path = get_conversation_path(conversation_id)
 
+    check_safe_name(filename, "message filename")
     message_file_path = conv_path / filename
     if not message_file_path.is_file():
         raise HTTPException(
@@ -774,11 +1468,14 @@ async def api_archive_message(conversation_id: str, filename: str):
 
         # Perform the move/rename operation
         message_file_path.rename(archived_file_path)
+        mark_conversation_changed(conversation_id)
 
-        return {
-            "message": "Message archived successfully.",
-            "archived_filename": archived_filename,
-        }
+        return json_response(
+            {
+                "message": "Message archived successfully.",
+                "archived_filename": archived_filename,
+            }
+        )
     except Exception as e:
         error_msg = f"Error archiving message '{filename}': {str(e)}"
         print(f"Error in api_archive_message: {error_msg}", file=sys.stderr)
@@ -791,22 +1488,14 @@ async def api_archive_message(conversation_id: str, filename: str):
 @app.put(
     "/api/conversation/{conversation_id}/message/{filename}/edit",
     status_code=status.HTTP_200_OK,
+    response_model=None,
 )
 async def api_edit_message(
     conversation_id: str, filename: str, request: MessageContentUpdateRequest
 ):
-    try:
-        conv_base_dir = get_conversations_dir()
-    except RuntimeError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    conv_path = conv_base_dir / conversation_id
-    if not conv_path.is_dir():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversation '{conversation_id}' not found.",
-        )
+    conv_path = get_conversation_path(conversation_id)
 
+    check_safe_name(filename, "message filename")
     message_file_path = conv_path / filename
     if not message_file_path.is_file():
         raise HTTPException(
@@ -815,20 +1504,30 @@ async def api_edit_message(
         )
 
     try:
-        # 1. Copy the current version to an archive file
+        # 1. Move the current version to an archive file. A rename keeps the
+        # old content without copying it.
         archived_filename = f"{int(time.time())}-archived-{filename}"
         archived_file_path = message_file_path.parent / archived_filename
-        shutil.copy2(str(message_file_path), str(archived_file_path))
-
-        # 2. Overwrite the original file with new content
-        message_file_path.write_text(request.content, encoding="utf-8")
+        message_file_path.replace(archived_file_path)
 
-        return {
-            "message": "Message updated successfully.",
-            "filename": filename,
-            "new_content": request.content,
-            "archived_as": archived_filename,
-        }
+        # 2. Write the new content at the original path
+        try:
+            message_file_path.write_text(request.content, encoding="utf-8")
+        except Exception:
+            # Put the original back so a failed edit doesn't lose the message
+            archived_file_path.replace(message_file_path)
+            raise
+        finally:
+            mark_conversation_changed(conversation_id)
+
+        return json_response(
+            {
+                "message": "Message updated successfully.",
+                "filename": filename,
+                "new_content": request.content,
+                "archived_as": archived_filename,
+            }
+        )
     except Exception as e:
         error_msg = f"Error editing message '{filename}': {str(e)}"
         print(f"Error in api_edit_message: {error_msg}", file=sys.stderr)
@@ -838,9 +1537,12 @@ async def api_edit_message(
 
 
 @app.post(
-    "/api/conversation/{conversation_id}/fork", status_code=status.HTTP_201_CREATED
+    "/api/conversation/{conversation_id}/fork",
+    status_code=status.HTTP_201_CREATED,
+    response_model=None,
 )
 async def api_fork_conversation(conversation_id: str):
+    check_safe_name(conversation_id, "conversation id")
     try:
         conv_base_dir = get_conversations_dir()
     except RuntimeError as e:
@@ -857,22 +1559,16 @@ async def api_fork_conversation(conversation_id: str):
     new_conversation_id = None
     new_conv_path = None
     try:
-        process = subprocess.run(
-            ["hnt-chat", "new"],
-            capture_output=True,
-            text=True,
-            check=False,
-            env=os.environ.copy(),
-        )
-        if process.returncode != 0:
-            error_detail = f"Failed to create new conversation base for fork. `hnt-chat new` exited with code {process.returncode}."
-            if process.stderr:
-                error_detail += f" Stderr: {process.stderr.strip()}"
+        returncode, stdout, stderr = await run_hnt_chat(["new"])
+        if returncode != 0:
+            error_detail = f"Failed to create new conversation base for fork. `hnt-chat new` exited with code {returncode}."
+            if stderr:
+                error_detail += f" Stderr: {stderr.strip()}"
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_detail
             )
 
-        new_conv_full_path_str = process.stdout.strip()
+        new_conv_full_path_str = stdout.strip()
         if not new_conv_full_path_str:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -893,10 +1589,15 @@ async def api_fork_conversation(conversation_id: str):
         )
 
     # 2. Copy every file in the A directory to B's directory
+    def copy_conversation_files():
+        with os.scandir(source_conv_path) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    copy_file_fast(entry.path, os.path.join(new_conv_path, entry.name))
+
     try:
-        for item in source_conv_path.iterdir():
-            if item.is_file():
-                shutil.copy2(item, new_conv_path / item.name)
+        # A long conversation is a lot of files; copy them off the event loop
+        await asyncio.to_thread(copy_conversation_files)
     except Exception as e:
         # If copying fails, it's a critical error for the fork.
         # Consider cleanup of new_conv_path if it should be atomic, but for now, error out.
@@ -909,25 +1610,23 @@ async def api_fork_conversation(conversation_id: str):
     title_file_path_in_b = new_conv_path / "title.txt"
     effective_title_from_a = "-"  # Default if title.txt wasn't copied or was empty
 
-    if title_file_path_in_b.is_file():
-        try:
-            title_content_from_a = title_file_path_in_b.read_text(
-                encoding="utf-8"
-            ).strip()
-            if title_content_from_a:
-                effective_title_from_a = title_content_from_a
-        except Exception as e:
-            print(
-                f"Fork: Error reading title.txt from newly copied {title_file_path_in_b}, defaulting to '-': {e}",
-                file=sys.stderr,
-            )
-            # effective_title_from_a remains "-"
+    try:
+        title_content_from_a = title_file_path_in_b.read_text(encoding="utf-8").strip()
+        if title_content_from_a:
+            effective_title_from_a = title_content_from_a
+    except FileNotFoundError:
+        pass  # A had no title.txt
+    except Exception as e:
+        print(
+            f"Fork: Error reading title.txt from newly copied {title_file_path_in_b}, defaulting to '-': {e}",
+            file=sys.stderr,
+        )
+        # effective_title_from_a remains "-"
 
-    match = re.match(r"^(.*)-(\d+)$", effective_title_from_a)
-    if match:
-        base_title_part = match.group(1)
-        numeric_suffix_part = match.group(2)
-        # Ensure base_title_part is not empty if effective_title_from_a was like "-1"
+    # Split a title like "Foo-3" into "Foo" and "3" from the right; no regex
+    # needed. isdecimal() accepts exactly the digits int() can parse.
+    base_title_part, sep, numeric_suffix_part = effective_title_from_a.rpartition("-")
+    if sep and numeric_suffix_part.isdecimal():
         # If base_title_part is "" (e.g. title was "-1"), new title will be "-2". This is fine.
         forked_title_str = f"{base_title_part}-{int(numeric_suffix_part) + 1}"
     else:
@@ -941,28 +1640,24 @@ async def api_fork_conversation(conversation_id: str):
             detail=f"Fork: Error writing new title to {title_file_path_in_b}: {str(e)}",
         )
 
-    return {
-        "message": "Conversation forked successfully.",
-        "new_conversation_id": new_conversation_id,
-    }
+    mark_conversation_changed(new_conversation_id)
+    return json_response(
+        {
+            "message": "Conversation forked successfully.",
+            "new_conversation_id": new_conversation_id,
+        },
+        status_code=status.HTTP_201_CREATED,
+    )
 
 
 # API endpoint to toggle pin status of a conversation
 @app.post(
-    "/api/conversation/{conversation_id}/pin-toggle", status_code=status.HTTP_200_OK
+    "/api/conversation/{conversation_id}/pin-toggle",
+    status_code=status.HTTP_200_OK,
+    response_model=None,
 )
 async def api_toggle_pin_conversation(conversation_id: str):
-    try:
-        conv_base_dir = get_conversations_dir()
-    except RuntimeError as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-    conv_path = conv_base_dir / conversation_id
-    if not conv_path.is_dir():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Conversation '{conversation_id}' not found.",
-        )
+    conv_path = get_conversation_path(conversation_id)
 
     pinned_file_path = conv_path / "pinned.txt"
     new_pinned_status: bool
@@ -978,6 +1673,7 @@ async def api_toggle_pin_conversation(conversation_id: str):
             pinned_file_path.touch()
             new_pinned_status = True
             action_message = "Conversation pinned successfully."
+        mark_conversation_changed(conversation_id)
 
     except Exception as e:
         raise HTTPException(
@@ -985,8 +1681,8 @@ async def api_toggle_pin_conversation(conversation_id: str):
             detail=f"Error updating pin status for conversation '{conversation_id}': {str(e)}",
         )
 
-    return JSONResponse(
-        content={"message": action_message, "pinned": new_pinned_status},
+    return json_response(
+        {"message": action_message, "pinned": new_pinned_status},
         status_code=status.HTTP_200_OK,
     )
 
@@ -1000,4 +1696,19 @@ if __name__ == "__main__":
     # uvicorn.run(app, host="127.0.0.1", port=8000, reload=True)
 
     # uvicorn.run(app, host="127.0.0.1", port=8000)
-    uvicorn.run(app, host="0.0.0.0", port=2027)
+    # uvloop and httptools are declared in the script dependencies above;
+    # request them explicitly so a missing install fails loudly instead of
+    # silently falling back to the slower asyncio/h11 implementations.
+    # Stay on a single worker: the page and conversation caches live in this
+    # process, and separate workers would each hold (and invalidate) their
+    # own copy. The per-request access log line is skipped; errors are still
+    # logged.
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=2027,
+        loop="uvloop",
+        http="httptools",
+        workers=1,
+        access_log=False,
+    )
@@ -22,6 +22,41 @@ document.addEventListener("DOMContentLoaded", () => {
 	const ICON_SAVE = `<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-save-icon lucide-save"><path d="M15.2 3a2 2 0 0 1 1.4.6l3.8 3.8a2 2 0 0 1 .6 1.4V19a2 2 0 0 1-2 2H5a2 2 0 0 1-2-2V5a2 2 0 0 1 2-2z"/><path d="M17 21v-7a1 1 0 0 0-1-1H8a1 1 0 0 0-1 1v7"/><path d="M7 3v4a1 1 0 0 0 1 1h7"/></svg>`;
 	const ICON_X = `<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" class="lucide lucide-x-icon lucide-x"><path d="M18 6 6 18"/><path d="m6 6 12 12"/></svg>`;
 
+	// Skeleton of a rendered message, parsed once and cloned for every message
+	const MESSAGE_TEMPLATE = document.createElement("template");
+	MESSAGE_TEMPLATE.innerHTML =
+		'<div class="message">' +
+		'<div class="message-content-wrapper"></div>' +
+		'<div class="message-footer">' +
+		'<div class="message-info"><span class="message-role"></span></div>' +
+		'<div class="message-actions"></div>' +
+		"</div>" +
+		"</div>";
+
+	// Class list for each message role the server reports (roles arrive
+	// lowercased), so rendering a message doesn't build the string each time
+	const MESSAGE_ROLE_CLASSES = {
+		system: "message message-system",
+		user: "message message-user",
+		assistant: "message message-assistant",
+		"assistant-reasoning": "message message-assistant-reasoning",
+		unknown: "message message-unknown",
+	};
+
+	// Parsed icon SVGs, keyed by their markup, so each icon string is parsed
+	// only once no matter how many buttons use it
+	const iconTemplates = new Map();
+
+	function createIconNode(svgIconHtml) {
+		let template = iconTemplates.get(svgIconHtml);
+		if (!template) {
+			template = document.createElement("template");
+			template.innerHTML = svgIconHtml;
+			iconTemplates.set(svgIconHtml, template);
+		}
+		return template.content.cloneNode(true);
+	}
+
 	const path = window.location.pathname;
 
 	if (path === "/") {
@@ -71,20 +106,24 @@ document.addEventListener("DOMContentLoaded", () => {
 
 					const a = document.createElement("a");
 					a.href = `/conversation-page/${encodeURIComponent(conv.id)}`;
-					a.textContent = escapeHtml(conv.id);
+					a.textContent = conv.id;
 					li.appendChild(a);
 
 					const titleSpan = document.createElement("span");
 					titleSpan.className = "conversation-list-title";
-					let displayTitle = escapeHtml(conv.title).trim();
+					let displayTitle = conv.title.trim();
 					if (!displayTitle) {
 						displayTitle = "-";
 					}
-					let titleContent = ` - ${displayTitle}`;
+					// Plain text plus a cloned icon node: no escaping pass over the
+					// title and no HTML parse per row
+					titleSpan.textContent = ` - ${displayTitle}`;
 					if (conv.is_pinned) {
-						titleContent += ` <span class="pin-emoji">${ICON_PIN}</span>`; // Use SVG icon
+						const pinSpan = document.createElement("span");
+						pinSpan.className = "pin-emoji";
+						pinSpan.appendChild(createIconNode(ICON_PIN)); // Use SVG icon
+						titleSpan.append(" ", pinSpan);
 					}
-					titleSpan.innerHTML = titleContent; // Use innerHTML for the emoji span
 					li.appendChild(titleSpan);
 
 					ul.appendChild(li);
@@ -178,11 +217,10 @@ document.addEventListener("DOMContentLoaded", () => {
 			"other-files-container",
 		);
 
-		const safeConvId = escapeHtml(conversationId);
-
-		// Initial state for inputs and buttons
-		document.title = `Loading: ${safeConvId}`;
-		mainTitleDisplayElement.textContent = `Loading conversation: ${safeConvId}...`;
+		// Titles, input values and text nodes are assigned as plain text, so
+		// nothing below needs escapeHtml(); only innerHTML markup does.
+		document.title = `Loading: ${conversationId}`;
+		mainTitleDisplayElement.textContent = `Loading conversation: ${conversationId}...`;
 		titleEditInput.value = "";
 		titleEditInput.disabled = true;
 		modelEditInput.value = "";
@@ -209,13 +247,13 @@ document.addEventListener("DOMContentLoaded", () => {
 			const updateDisplayedTitle = (currentTitle) => {
 				const displayPageTitle =
 					currentTitle && currentTitle !== "-"
-						? `${escapeHtml(currentTitle)} (${safeConvId})`
-						: `Conversation: ${safeConvId}`;
+						? `${currentTitle} (${conversationId})`
+						: `Conversation: ${conversationId}`;
 				document.title = displayPageTitle;
 				mainTitleDisplayElement.textContent = displayPageTitle;
 			};
 			updateDisplayedTitle(convTitle);
-			titleEditInput.value = escapeHtml(convTitle === "-" ? "" : convTitle);
+			titleEditInput.value = convTitle === "-" ? "" : convTitle;
 			titleEditInput.dataset.originalTitle = convTitle;
 			titleEditInput.disabled = false;
 
@@ -237,14 +275,10 @@ document.addEventListener("DOMContentLoaded", () => {
 						// updateConversationTitle handles updating dataset.originalTitle and input value on success
 						updateDisplayedTitle(titleEditInput.dataset.originalTitle); // Update H1 and document title
 					} catch (error) {
-						titleEditInput.value = escapeHtml(
-							originalTitle === "-" ? "" : originalTitle,
-						);
+						titleEditInput.value = originalTitle === "-" ? "" : originalTitle;
 					}
 				} else {
-					titleEditInput.value = escapeHtml(
-						originalTitle === "-" ? "" : originalTitle,
-					);
+					titleEditInput.value = originalTitle === "-" ? "" : originalTitle;
 				}
 			});
 			titleEditInput.addEventListener("keypress", (event) => {
@@ -253,7 +287,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
 			// --- Model Handling ---
 			const convModel = data.model || DEFAULT_MODEL_NAME; // Backend ensures default if missing/empty
-			modelEditInput.value = escapeHtml(convModel);
+			modelEditInput.value = convModel;
 			modelEditInput.dataset.originalModel = convModel;
 			modelEditInput.disabled = false;
 
@@ -270,11 +304,11 @@ document.addEventListener("DOMContentLoaded", () => {
 						);
 						// updateConversationModel handles updating dataset.originalModel and input value
 					} catch (error) {
-						modelEditInput.value = escapeHtml(originalModel);
+						modelEditInput.value = originalModel;
 					}
 				} else {
 					// Ensure field shows the clean originalModel if user just added/removed spaces
-					modelEditInput.value = escapeHtml(originalModel);
+					modelEditInput.value = originalModel;
 				}
 			});
 			modelEditInput.addEventListener("keypress", (event) => {
@@ -301,32 +335,25 @@ document.addEventListener("DOMContentLoaded", () => {
 			// Render messages
 			messagesContainer.innerHTML = ""; // Clear potential loading/error states
 			if (data.messages && data.messages.length > 0) {
+				// Build every message off-DOM and attach them in a single insertion
+				const messagesFragment = document.createDocumentFragment();
 				data.messages.forEach((msg) => {
-					const messageDiv = document.createElement("div");
-					messageDiv.className = `message message-${escapeHtml(msg.role.toLowerCase())}`;
+					// Clone the prebuilt skeleton instead of creating each element
+					const messageDiv =
+						MESSAGE_TEMPLATE.content.firstElementChild.cloneNode(true);
+					messageDiv.className =
+						MESSAGE_ROLE_CLASSES[msg.role] ||
+						`message message-${msg.role.toLowerCase()}`;
 					messageDiv.dataset.filename = msg.filename; // Store filename for actions
 
-					// Wrapper for content to allow easy replacement (text <-> textarea)
-					const contentWrapperDiv = document.createElement("div");
-					contentWrapperDiv.className = "message-content-wrapper";
+					// Wrapper for content to allow easy replacement (text <-> textarea),
+					// followed by the compact footer
+					const [contentWrapperDiv, footerDiv] = messageDiv.children;
 					contentWrapperDiv.textContent = msg.content; // Initial content display
 
-					// New compact footer
-					const footerDiv = document.createElement("div");
-					footerDiv.className = "message-footer";
-
-					const infoDiv = document.createElement("div");
-					infoDiv.className = "message-info";
-
-					const roleSpan = document.createElement("span");
-					roleSpan.className = "message-role";
-					roleSpan.textContent = escapeHtml(msg.role);
-
-					infoDiv.appendChild(roleSpan);
-
 					// Actions (Edit, Archive) - this is now just a button container
-					const actionsDiv = document.createElement("div");
-					actionsDiv.className = "message-actions";
+					const [infoDiv, actionsDiv] = footerDiv.children;
+					infoDiv.firstElementChild.textContent = msg.role; // .message-role
 
 					const infoButton = createActionButton(ICON_INFO, "btn-info", () =>
 						showMessageInfoModal(msg.filename, msg.content),
@@ -357,13 +384,9 @@ document.addEventListener("DOMContentLoaded", () => {
 					actionsDiv.appendChild(editButton);
 					actionsDiv.appendChild(archiveButton);
 
-					footerDiv.appendChild(infoDiv);
-					footerDiv.appendChild(actionsDiv);
-
-					messageDiv.appendChild(contentWrapperDiv);
-					messageDiv.appendChild(footerDiv);
-					messagesContainer.appendChild(messageDiv);
+					messagesFragment.appendChild(messageDiv);
 				});
+				messagesContainer.appendChild(messagesFragment);
 			} else {
 				messagesContainer.innerHTML =
 					"<p>No messages found in this conversation.</p>";
@@ -383,7 +406,7 @@ document.addEventListener("DOMContentLoaded", () => {
 					li.className = "other-file-entry";
 
 					const strong = document.createElement("strong");
-					strong.textContent = escapeHtml(file.filename);
+					strong.textContent = file.filename;
 					li.appendChild(strong);
 
 					if (file.is_text && file.content !== null) {
@@ -398,16 +421,13 @@ document.addEventListener("DOMContentLoaded", () => {
 						// Use binary style for error messages related to file content
 						errorDisplayDiv.className =
 							"other-file-content other-file-content-binary";
-						errorDisplayDiv.textContent = escapeHtml(
-							file.error_message || "[Unknown issue with file]",
-						);
+						errorDisplayDiv.textContent =
+							file.error_message || "[Unknown issue with file]";
 						li.appendChild(errorDisplayDiv);
 					}
 					ul.appendChild(li);
 				});
-				otherFilesContainer.appendChild(divider);
-				otherFilesContainer.appendChild(heading);
-				otherFilesContainer.appendChild(ul);
+				otherFilesContainer.append(divider, heading, ul); // Single insertion
 			}
 
 			// After rendering messages and other files, set up the input area
@@ -714,7 +734,7 @@ document.addEventListener("DOMContentLoaded", () => {
 	function createActionButton(svgIconHtml, className, onClick) {
 		const button = document.createElement("button");
 		button.type = "button";
-		button.innerHTML = svgIconHtml; // Use innerHTML for SVG icons
+		button.appendChild(createIconNode(svgIconHtml)); // Cloned, not re-parsed
 		button.className = className; // Add class for styling
 		button.addEventListener("click", onClick);
 		return button;
@@ -1041,7 +1061,7 @@ document.addEventListener("DOMContentLoaded", () => {
 			}
 			// Update placeholder to show error if stream itself failed or setup failed.
 			filenameSpan.textContent = "Error";
-			contentWrapperDiv.textContent = `Error during generation: ${escapeHtml(error.message)}`;
+			contentWrapperDiv.textContent = `Error during generation: ${error.message}`;
 			// Do not re-enable buttons here, `finally` block below calls loadConversationDetails
 			// which will fully reconstruct the input area.
 			// If loadConversationDetails is skipped on error, then buttons should be re-enabled.
@@ -1092,7 +1112,7 @@ document.addEventListener("DOMContentLoaded", () => {
 				inputElement.style.borderColor = "";
 			}, 1500);
 
-			inputElement.value = escapeHtml(savedTitle === "-" ? "" : savedTitle);
+			inputElement.value = savedTitle === "-" ? "" : savedTitle;
 			inputElement.dataset.originalTitle = savedTitle;
 			console.log(`Title for ${conversationId} updated to "${savedTitle}"`);
 		} catch (error) {
@@ -1141,7 +1161,7 @@ document.addEventListener("DOMContentLoaded", () => {
 				inputElement.style.borderColor = "";
 			}, 1500);
 
-			inputElement.value = escapeHtml(savedModel); // Update input to what was actually saved
+			inputElement.value = savedModel; // Update input to what was actually saved
 			inputElement.dataset.originalModel = savedModel;
 			console.log(`Model for ${conversationId} updated to "${savedModel}"`);
 		} catch (error) {
@@ -1197,7 +1217,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
 		const errorP = document.createElement("p");
 		errorP.className = "error-message";
-		errorP.textContent = escapeHtml(message);
+		errorP.textContent = message;
 
 		if (targetContainer && targetContainer.tagName === "LI") {
 			// Specific for conversation list items